@@ -1,9 +1,15 @@
+import heapq
+import io
 import os
-import json
-import math
+import shelve
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
+from urllib.parse import urlencode
 
-import requests
+import httpx
+import numpy as np
+import orjson
+from numba import njit
 
 REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 DATA_DIR = os.path.join(REPO_ROOT, "data")
@@ -19,22 +25,110 @@ if GH_TOKEN:
     HEADERS["Authorization"] = f"Bearer {GH_TOKEN}"
 
 
-def gh_get(url, params=None):
-    r = requests.get(url, headers=HEADERS, params=params, timeout=30)
-    r.raise_for_status()
-    return r.json()
-
-
-def clamp(x, lo=0.0, hi=1.0):
-    return max(lo, min(hi, x))
+# One HTTP/2 client for the whole run: every request shares a single
+# multiplexed TLS connection, and the transport retries connection
+# failures.
+CLIENT = httpx.Client(
+    headers=HEADERS,
+    timeout=30,
+    transport=httpx.HTTPTransport(
+        http2=True,
+        retries=5,
+        limits=httpx.Limits(max_connections=20),
+    ),
+)
 
 
-def logistic(z):
-    return 1.0 / (1.0 + math.exp(-z))
+# GitHub serves 304 Not Modified for free (no rate-limit charge) when we
+# replay the ETag from an earlier response, so remember one per URL.
+ETAG_CACHE_PATH = os.path.join(DATA_DIR, "etag_cache")
 
 
-def iso_to_dt(s):
-    return datetime.fromisoformat(s.replace("Z", "+00:00"))
+def gh_get(url, params=None):
+    key = url if params is None else f"{url}?{urlencode(sorted(params.items()))}"
+    with shelve.open(ETAG_CACHE_PATH) as cache:
+        cached = cache.get(key)
+        headers = {"If-None-Match": cached[0]} if cached else {}
+        r = CLIENT.get(url, params=params, headers=headers)
+        if r.status_code == 304 and cached:
+            return cached[1]
+        r.raise_for_status()
+        body = r.json()
+        etag = r.headers.get("ETag")
+        if etag:
+            cache[key] = (etag, body)
+    return body
+
+
+MODEL_INFO = {"type": "heuristic_logistic_v1", "notes": "Reproducible baseline. No LLM."}
+
+
+# Slotted records instead of per-repo dict literals: roughly half the
+# per-row memory, and orjson serializes dataclasses natively.
+@dataclass(slots=True)
+class Snapshot:
+    date_utc: str
+    full_name: str
+    html_url: str
+    stars_now: int
+    forks_now: int
+    issues_now: int
+    language: str
+    created_at: str
+    pushed_at: str
+
+
+@dataclass(slots=True)
+class Features:
+    age_days: float
+    since_push_days: float
+    stars_per_day: float
+    forks_now: int
+    issues_now: int
+    language: str
+
+
+@dataclass(slots=True)
+class Prediction:
+    date_utc: str
+    full_name: str
+    html_url: str
+    stars_now: int
+    breakout_threshold_7d: int
+    p_breakout_7d: float
+    stars_pred_7d: int
+    stars_pred_low_7d: int
+    stars_pred_high_7d: int
+    features: Features
+    model: dict
+
+
+@njit(cache=True)
+def score_kernel(stars, forks, age_days, since_push_days):
+    """Model math for one day's batch, compiled once and cached on disk.
+
+    All four inputs are contiguous float64 arrays of equal length.
+    """
+    stars_per_day = stars / age_days
+    z = (
+        0.9 * np.log10(stars_per_day + 0.01)
+        - 0.25 * since_push_days
+        + 0.15 * np.log10(forks + 1.0)
+    )
+    # Stable expit: exponentiate the non-positive branch only, selected
+    # per element without a Python-level branch, so large |z| cannot
+    # overflow np.exp.
+    nonneg = z >= 0.0
+    ez = np.exp(np.where(nonneg, -z, z))
+    p = np.where(nonneg, 1.0 / (1.0 + ez), ez / (1.0 + ez))
+    p = np.minimum(np.maximum(p, 0.0), 1.0)
+
+    threshold = np.maximum(200.0, 0.5 * stars)
+    stars_pred = np.rint(stars + 7.0 * stars_per_day * (0.8 + 0.6 * p))
+    band = np.rint(np.maximum(25.0, 0.25 * threshold * (1.0 - p)))
+    low = np.maximum(0.0, stars_pred - band)
+    high = stars_pred + band
+    return p, stars_per_day, threshold, stars_pred, low, high
 
 
 def main():
@@ -44,125 +138,141 @@ def main():
     created_since = (now - timedelta(days=14)).date().isoformat()
     q = f"created:>={created_since} stars:>=50 archived:false"
 
-    search = gh_get(
-        "https://api.github.com/search/repositories",
-        params={"q": q, "sort": "stars", "order": "desc", "per_page": 30},
+    # The search payload already carries every field we read below, so
+    # there is no need to refetch each repo individually. Page through
+    # at 100 rows per request; the search API serves at most 1000 hits.
+    repos = []
+    page = 1
+    while True:
+        search = gh_get(
+            "https://api.github.com/search/repositories",
+            params={"q": q, "sort": "stars", "order": "desc", "per_page": 100, "page": page},
+        )
+        batch = search.get("items", [])
+        repos.extend(batch)
+        if len(batch) < 100 or len(repos) >= 1000:
+            break
+        page += 1
+
+    n = len(repos)
+
+    # Struct-of-arrays layout: one contiguous array per feature so the
+    # model math below runs as whole-array NumPy ops instead of a
+    # Python-level loop per repo.
+    stars = np.fromiter(
+        (int(r.get("stargazers_count", 0)) for r in repos), dtype=np.int64, count=n
+    )
+    forks = np.fromiter(
+        (int(r.get("forks_count", 0)) for r in repos), dtype=np.int64, count=n
+    )
+    issues = np.fromiter(
+        (int(r.get("open_issues_count", 0)) for r in repos), dtype=np.int64, count=n
     )
+    languages = [r.get("language") or "Unknown" for r in repos]
 
-    items = search.get("items", [])
-    repos = []
-    for it in items:
-        full_name = it["full_name"]
-        repo = gh_get(f"https://api.github.com/repos/{full_name}")
-        repos.append(repo)
+    # Parse both timestamp columns in bulk: datetime64[s] arrays are
+    # int64 underneath, so the age math is two vector subtractions
+    # instead of 2N fromisoformat calls.
+    created = np.array(
+        [r["created_at"].rstrip("Z") for r in repos], dtype="datetime64[s]"
+    )
+    pushed = np.array([r["pushed_at"].rstrip("Z") for r in repos], dtype="datetime64[s]")
+    now64 = np.datetime64(int(now.timestamp()), "s")
+    age_days = np.maximum(1.0, (now64 - created).astype(np.int64) / 86400.0)
+    since_push_days = np.maximum(0.0, (now64 - pushed).astype(np.int64) / 86400.0)
+
+    p_breakout, stars_per_day, breakout_threshold, stars_pred_7d, low, high = score_kernel(
+        stars.astype(np.float64),
+        forks.astype(np.float64),
+        age_days,
+        since_push_days,
+    )
+    breakout_threshold = breakout_threshold.astype(np.int64)
+    stars_pred_7d = stars_pred_7d.astype(np.int64)
+    low = low.astype(np.int64)
+    high = high.astype(np.int64)
 
     snapshot = []
     predictions = []
 
-    for repo in repos:
-        stars_now = int(repo.get("stargazers_count", 0))
-        forks_now = int(repo.get("forks_count", 0))
-        issues_now = int(repo.get("open_issues_count", 0))
-        language = repo.get("language") or "Unknown"
-
-        created_at = iso_to_dt(repo["created_at"])
-        pushed_at = iso_to_dt(repo["pushed_at"])
-        age_days = max(1.0, (now - created_at).total_seconds() / 86400.0)
-        since_push_days = max(0.0, (now - pushed_at).total_seconds() / 86400.0)
-
-        stars_per_day = stars_now / age_days
-
-        z = (
-            0.9 * math.log10(stars_per_day + 0.01)
-            - 0.25 * since_push_days
-            + 0.15 * math.log10(forks_now + 1)
-        )
-        p_breakout = clamp(logistic(z))
-
-        breakout_threshold = int(max(200, 0.5 * stars_now))
-
-        stars_pred_7d = int(
-            round(stars_now + (7 * stars_per_day * (0.8 + 0.6 * p_breakout)))
-        )
-        band = int(round(max(25, 0.25 * breakout_threshold * (1.0 - p_breakout))))
-        low = max(0, stars_pred_7d - band)
-        high = stars_pred_7d + band
-
+    for i, repo in enumerate(repos):
         snapshot.append(
-            {
-                "date_utc": today,
-                "full_name": repo["full_name"],
-                "html_url": repo["html_url"],
-                "stars_now": stars_now,
-                "forks_now": forks_now,
-                "issues_now": issues_now,
-                "language": language,
-                "created_at": repo["created_at"],
-                "pushed_at": repo["pushed_at"],
-            }
+            Snapshot(
+                date_utc=today,
+                full_name=repo["full_name"],
+                html_url=repo["html_url"],
+                stars_now=int(stars[i]),
+                forks_now=int(forks[i]),
+                issues_now=int(issues[i]),
+                language=languages[i],
+                created_at=repo["created_at"],
+                pushed_at=repo["pushed_at"],
+            )
         )
 
         predictions.append(
-            {
-                "date_utc": today,
-                "full_name": repo["full_name"],
-                "html_url": repo["html_url"],
-                "stars_now": stars_now,
-                "breakout_threshold_7d": breakout_threshold,
-                "p_breakout_7d": round(p_breakout, 4),
-                "stars_pred_7d": stars_pred_7d,
-                "stars_pred_low_7d": low,
-                "stars_pred_high_7d": high,
-                "features": {
-                    "age_days": round(age_days, 3),
-                    "since_push_days": round(since_push_days, 3),
-                    "stars_per_day": round(stars_per_day, 3),
-                    "forks_now": forks_now,
-                    "issues_now": issues_now,
-                    "language": language,
-                },
-                "model": {"type": "heuristic_logistic_v1", "notes": "Reproducible baseline. No LLM."},
-            }
+            Prediction(
+                date_utc=today,
+                full_name=repo["full_name"],
+                html_url=repo["html_url"],
+                stars_now=int(stars[i]),
+                breakout_threshold_7d=int(breakout_threshold[i]),
+                p_breakout_7d=round(float(p_breakout[i]), 4),
+                stars_pred_7d=int(stars_pred_7d[i]),
+                stars_pred_low_7d=int(low[i]),
+                stars_pred_high_7d=int(high[i]),
+                features=Features(
+                    age_days=round(float(age_days[i]), 3),
+                    since_push_days=round(float(since_push_days[i]), 3),
+                    stars_per_day=round(float(stars_per_day[i]), 3),
+                    forks_now=int(forks[i]),
+                    issues_now=int(issues[i]),
+                    language=languages[i],
+                ),
+                model=MODEL_INFO,
+            )
         )
 
     snap_path = os.path.join(DATA_DIR, f"snapshots_{today}.json")
     pred_path = os.path.join(PRED_DIR, f"predictions_{today}.json")
-    with open(snap_path, "w", encoding="utf-8") as f:
-        json.dump(snapshot, f, indent=2)
-    with open(pred_path, "w", encoding="utf-8") as f:
-        json.dump(predictions, f, indent=2)
-
-    top = sorted(predictions, key=lambda x: x["p_breakout_7d"], reverse=True)[:5]
-
-    lines = []
-    lines.append("RepoPulse forecast (7-day breakout watchlist)")
-    lines.append("")
-    lines.append("Method: reproducible baseline model using public GitHub signals (no LLM).")
-    lines.append("Breakout = +max(200 stars, +50%) within 7 days.")
-    lines.append("")
+    with open(snap_path, "wb") as f:
+        f.write(orjson.dumps(snapshot, option=orjson.OPT_INDENT_2))
+    with open(pred_path, "wb") as f:
+        f.write(orjson.dumps(predictions, option=orjson.OPT_INDENT_2))
+
+    top = heapq.nlargest(5, predictions, key=lambda x: x.p_breakout_7d)
+
+    body = io.StringIO()
+    body.write(
+        "RepoPulse forecast (7-day breakout watchlist)\n"
+        "\n"
+        "Method: reproducible baseline model using public GitHub signals (no LLM).\n"
+        "Breakout = +max(200 stars, +50%) within 7 days.\n"
+        "\n"
+    )
 
     for i, r in enumerate(top, start=1):
-        p = int(round(100 * r["p_breakout_7d"]))
-        lines.append(
-            f"{i}) {r['full_name']} | {p}% | stars now {r['stars_now']} → "
-            f"est {r['stars_pred_7d']} "
-            f"(range {r['stars_pred_low_7d']}-{r['stars_pred_high_7d']})"
+        p = int(round(100 * r.p_breakout_7d))
+        body.write(
+            f"{i}) {r.full_name} | {p}% | stars now {r.stars_now} → "
+            f"est {r.stars_pred_7d} "
+            f"(range {r.stars_pred_low_7d}-{r.stars_pred_high_7d})\n"
+            f"   {r.html_url}\n"
         )
-        lines.append(f"   {r['html_url']}")
 
-    lines.append("")
-    lines.append(
-        "Daily forecasts are logged publicly, then scored 7 days later (hits, misses, calibration)."
+    body.write(
+        "\n"
+        "Daily forecasts are logged publicly, then scored 7 days later (hits, misses, calibration).\n"
+        "#opensource #software #datascience #forecasting #github"
     )
-    lines.append("#opensource #software #datascience #forecasting #github")
 
-    text = "\n".join(lines).strip()
+    text = body.getvalue().strip()
 
     post_payload = {"post_id": f"repopulse-{today}", "date_utc": today, "text": text}
 
     post_path = os.path.join(POSTS_DIR, f"post_{today}.json")
-    with open(post_path, "w", encoding="utf-8") as f:
-        json.dump(post_payload, f, indent=2)
+    with open(post_path, "wb") as f:
+        f.write(orjson.dumps(post_payload, option=orjson.OPT_INDENT_2))
 
     print(f"Wrote: {snap_path}")
     print(f"Wrote: {pred_path}")
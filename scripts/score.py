@@ -1,8 +1,12 @@
+import asyncio
 import os
-import json
 import csv
+import mmap
 from datetime import datetime, timedelta, timezone
-import requests
+import httpx
+import orjson
+import pyarrow as pa
+import pyarrow.parquet as pq
 
 REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 PRED_DIR = os.path.join(REPO_ROOT, "predictions")
@@ -15,11 +19,81 @@ if GH_TOKEN:
     HEADERS["Authorization"] = f"Bearer {GH_TOKEN}"
 
 OUTCOMES_CSV = os.path.join(DATA_DIR, "outcomes.csv")
-
-def gh_get(url, params=None):
-    r = requests.get(url, headers=HEADERS, params=params, timeout=30)
-    r.raise_for_status()
-    return r.json()
+OUTCOMES_DIR = os.path.join(DATA_DIR, "outcomes")
+
+# Legacy CSV append, kept until downstream readers move to the Parquet
+# dataset; set WRITE_OUTCOMES_CSV=0 to drop it.
+WRITE_OUTCOMES_CSV = os.environ.get("WRITE_OUTCOMES_CSV", "1") == "1"
+
+# Column order for outcomes.csv; must stay in sync with the row dicts
+# built in main().
+FIELDS = (
+    "prediction_date_utc",
+    "scored_date_utc",
+    "full_name",
+    "html_url",
+    "stars_at_prediction",
+    "stars_after_7d",
+    "delta_stars",
+    "breakout_threshold",
+    "breakout_actual",
+    "p_breakout_7d",
+    "brier_score",
+    "stars_pred_7d",
+    "abs_error_stars",
+    "model",
+)
+
+# GitHub's secondary rate limit frowns on too many parallel requests.
+MAX_CONCURRENT_FETCHES = 10
+
+GRAPHQL_URL = "https://api.github.com/graphql"
+# Stay comfortably under GraphQL's per-query node limits.
+GRAPHQL_BATCH_SIZE = 100
+
+def _star_count_query(full_names):
+    parts = []
+    for i, full_name in enumerate(full_names):
+        owner, name = full_name.split("/", 1)
+        parts.append(
+            f'r{i}: repository(owner: "{owner}", name: "{name}") {{ stargazerCount }}'
+        )
+    return "query { " + " ".join(parts) + " }"
+
+async def _post_json(client, sem, url, payload):
+    async with sem:
+        r = await client.post(url, json=payload)
+        r.raise_for_status()
+        return r.json()
+
+async def _fetch_star_counts(full_names):
+    chunks = [
+        full_names[i : i + GRAPHQL_BATCH_SIZE]
+        for i in range(0, len(full_names), GRAPHQL_BATCH_SIZE)
+    ]
+    sem = asyncio.Semaphore(MAX_CONCURRENT_FETCHES)
+    async with httpx.AsyncClient(
+        http2=True,
+        headers=HEADERS,
+        timeout=30,
+        limits=httpx.Limits(max_connections=MAX_CONCURRENT_FETCHES),
+    ) as client:
+        tasks = [
+            _post_json(client, sem, GRAPHQL_URL, {"query": _star_count_query(chunk)})
+            for chunk in chunks
+        ]
+        results = await asyncio.gather(*tasks)
+
+    counts = []
+    for chunk, result in zip(chunks, results):
+        data = result.get("data") or {}
+        for i in range(len(chunk)):
+            node = data.get(f"r{i}") or {}
+            counts.append(int(node.get("stargazerCount", 0)))
+    return counts
+
+def fetch_star_counts(full_names):
+    return asyncio.run(_fetch_star_counts(full_names))
 
 def brier(p, y):
     return (p - y) ** 2
@@ -33,17 +107,21 @@ def main():
         print(f"No predictions file for {target_date}, nothing to score.")
         return
 
-    with open(pred_path, "r", encoding="utf-8") as f:
-        preds = json.load(f)
+    # Parse straight out of the page cache: orjson reads the mapped
+    # buffer in place, so the file bytes are never copied into a
+    # Python bytes object first.
+    with open(pred_path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            preds = orjson.loads(memoryview(mm))
+
+    star_counts = fetch_star_counts([p["full_name"] for p in preds])
 
     rows = []
     brier_scores = []
     abs_errors = []
 
-    for p in preds:
+    for p, stars_then in zip(preds, star_counts):
         full_name = p["full_name"]
-        repo = gh_get(f"https://api.github.com/repos/{full_name}")
-        stars_then = int(repo.get("stargazers_count", 0))
 
         stars_at_pred = int(p["stars_now"])
         delta = stars_then - stars_at_pred
@@ -78,12 +156,22 @@ def main():
     mean_brier = sum(brier_scores) / max(1, len(brier_scores))
     mean_mae = sum(abs_errors) / max(1, len(abs_errors))
 
-    file_exists = os.path.exists(OUTCOMES_CSV)
-    with open(OUTCOMES_CSV, "a", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
-        if not file_exists:
-            writer.writeheader()
-        writer.writerows(rows)
+    # Each run adds one partition under data/outcomes/, so the append is
+    # a new file rather than a rewrite, and dashboards get columnar
+    # reads with projection instead of re-parsing the whole CSV.
+    pq.write_to_dataset(
+        pa.Table.from_pylist(rows),
+        root_path=OUTCOMES_DIR,
+        partition_cols=["prediction_date_utc"],
+    )
+
+    if WRITE_OUTCOMES_CSV:
+        file_exists = os.path.exists(OUTCOMES_CSV)
+        with open(OUTCOMES_CSV, "a", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            if not file_exists:
+                writer.writerow(FIELDS)
+            writer.writerows(tuple(r[k] for k in FIELDS) for r in rows)
 
     summary = {
         "prediction_date_utc": target_date,
@@ -93,12 +181,14 @@ def main():
         "mean_mae_stars": round(mean_mae, 3),
     }
     summary_path = os.path.join(DATA_DIR, f"summary_{target_date}.json")
-    with open(summary_path, "w", encoding="utf-8") as f:
-        json.dump(summary, f, indent=2)
+    with open(summary_path, "wb") as f:
+        f.write(orjson.dumps(summary, option=orjson.OPT_INDENT_2))
 
     print(f"Scored {len(rows)} repos from {target_date}")
     print(f"Mean Brier: {mean_brier:.4f} | Mean MAE(stars): {mean_mae:.1f}")
-    print(f"Appended to: {OUTCOMES_CSV}")
+    print(f"Appended to: {OUTCOMES_DIR}")
+    if WRITE_OUTCOMES_CSV:
+        print(f"Appended to: {OUTCOMES_CSV}")
     print(f"Wrote: {summary_path}")
 
 if __name__ == "__main__":
@@ -1,13 +1,20 @@
 import os
-import json
 from datetime import datetime, timezone
-import requests
+import httpx
+import orjson
 
 REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 POSTS_DIR = os.path.join(REPO_ROOT, "posts")
 
 MAKE_WEBHOOK_URL = os.environ.get("MAKE_WEBHOOK_URL")
 
+# Retries cover connection-level failures only; POST is not retried
+# after the request is sent, so the webhook cannot double-fire.
+CLIENT = httpx.Client(
+    timeout=30,
+    transport=httpx.HTTPTransport(http2=True, retries=5),
+)
+
 def main():
     if not MAKE_WEBHOOK_URL:
         raise RuntimeError("MAKE_WEBHOOK_URL is not set")
@@ -17,12 +24,18 @@ def main():
     if not os.path.exists(post_path):
         raise FileNotFoundError(f"Post file not found: {post_path}")
 
-    with open(post_path, "r", encoding="utf-8") as f:
-        payload = json.load(f)
+    # The file is already JSON, so ship its bytes as-is instead of
+    # decoding and re-encoding the payload.
+    with open(post_path, "rb") as f:
+        body = f.read()
 
-    r = requests.post(MAKE_WEBHOOK_URL, json=payload, timeout=30)
+    r = CLIENT.post(
+        MAKE_WEBHOOK_URL,
+        content=body,
+        headers={"Content-Type": "application/json"},
+    )
     r.raise_for_status()
-    print(f"Triggered Make for {payload.get('post_id')}")
+    print(f"Triggered Make for {orjson.loads(body).get('post_id')}")
 
 if __name__ == "__main__":
     main()